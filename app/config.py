@@ -6,9 +6,11 @@ class Settings(BaseSettings):
     SUPABASE_URL: str
     SUPABASE_KEY: str
     SUPABASE_SERVICE_ROLE_KEY: str  # For admin operations
+    SUPABASE_JWT_SECRET: str  # For local JWT verification
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    IMPORT_BATCH_SIZE: int = 1000  # Rows per insert during bulk uploads
 
     class Config:
         env_file = ".env"
@@ -1,14 +1,40 @@
 # backend/app/core/auth.py
+import hashlib
+import time
+from types import SimpleNamespace
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from app.db import get_supabase
+from cachetools import TTLCache
+from jose import jwt
+from app.config import get_settings
 from app.core.logging_config import logger
 from typing import List
-from supabase import Client
 from enum import Enum
 
+settings = get_settings()
+
 security = HTTPBearer()
 
+# Verified tokens are cached briefly so bursts of requests from the same
+# user skip the network round-trip to GoTrue. Entries expire after
+# TOKEN_CACHE_TTL seconds or at the JWT's own expiry, whichever is sooner.
+TOKEN_CACHE_TTL = 30
+_token_cache = TTLCache(maxsize=10000, ttl=TOKEN_CACHE_TTL)
+
+
+def _token_cache_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()[:32]
+
+
+def _token_expiry(token: str) -> float:
+    """Read the JWT exp claim without verifying the signature."""
+    try:
+        claims = jwt.get_unverified_claims(token)
+        return float(claims["exp"])
+    except Exception:
+        return 0.0
+
 
 class UserRole(str, Enum):
     ADMIN = "admin"
@@ -18,10 +44,14 @@ class UserRole(str, Enum):
 
 def check_roles(required_roles: List[UserRole]):
     """Decorator factory for role checking"""
+    # Precompute the allowed role strings once per decorated endpoint so
+    # the per-request check is a single set lookup — no UserRole(...)
+    # construction (which raises on unknown roles) on the hot path
+    allowed = frozenset(role.value for role in required_roles)
 
     async def role_checker(current_user: dict = Depends(get_current_user)) -> dict:
-        user_role = UserRole(current_user.user_metadata.get("role", "student"))
-        if user_role not in required_roles:
+        user_role = current_user.user_metadata.get("role", "student")
+        if user_role not in allowed:
             logger.warning(
                 f"User {current_user.id} with role {user_role} attempted to access restricted endpoint"
             )
@@ -33,13 +63,45 @@ def check_roles(required_roles: List[UserRole]):
     return role_checker
 
 
+def _decode_token(token: str) -> SimpleNamespace:
+    """Verify the JWT locally and build a user object from its claims.
+
+    Supabase signs access tokens with the project JWT secret (HS256), so
+    verification is a pure CPU operation — no round-trip to GoTrue. The
+    returned object mirrors the attributes downstream code reads from
+    gotrue's User (``id``, ``email``, ``user_metadata``).
+    """
+    payload = jwt.decode(
+        token,
+        settings.SUPABASE_JWT_SECRET,
+        algorithms=["HS256"],
+        audience="authenticated",
+    )
+    return SimpleNamespace(
+        id=payload["sub"],
+        email=payload.get("email"),
+        user_metadata=payload.get("user_metadata") or {},
+        role=payload.get("role"),
+    )
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    supabase: Client = Depends(get_supabase),
 ) -> dict:
+    token = credentials.credentials
+    key = _token_cache_key(token)
+    cached = _token_cache.get(key)
+    if cached is not None:
+        user, deadline = cached
+        if time.time() < deadline:
+            return user
+        del _token_cache[key]
     try:
-        user = supabase.auth.get_user(credentials.credentials)
-        return user.user
+        user = _decode_token(token)
+        deadline = min(time.time() + TOKEN_CACHE_TTL, _token_expiry(token))
+        if deadline > time.time():
+            _token_cache[key] = (user, deadline)
+        return user
     except Exception as e:
         logger.error(f"Authentication error: {str(e)}")
         raise HTTPException(
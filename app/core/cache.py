@@ -0,0 +1,44 @@
+# backend/app/core/cache.py
+from cachetools import TTLCache
+from supabase import AsyncClient
+
+# Responses for the read-heavy per-user stats endpoints. Dashboards poll
+# these with identical arguments, so hits are served from RAM instead of
+# a Supabase round-trip. Keys look like "<user_id>:<endpoint>:<params>".
+# For multi-instance deploys this would move to Redis with the same key
+# scheme.
+stats_cache = TTLCache(maxsize=10_000, ttl=30)
+
+
+def invalidate_user_stats(user_id: str) -> None:
+    """Drop every cached stats entry for one user (called on writes)."""
+    prefix = f"{user_id}:"
+    for key in [k for k in stats_cache if k.startswith(prefix)]:
+        stats_cache.pop(key, None)
+
+
+# TMUA filter values are effectively static — they only change on an
+# admin bulk upload. One RPC (tmua_filters migration) returns the
+# DISTINCT topics and sources as a single row, and the result is kept
+# in memory for an hour; bulk uploads invalidate it explicitly, so the
+# TTL only bounds staleness from out-of-band edits.
+_tmua_filters_cache = TTLCache(maxsize=1, ttl=3600)
+
+
+async def get_tmua_filters(supabase: AsyncClient) -> dict:
+    """Get {"topics": [...], "sources": [...]} for the question catalog."""
+    filters = _tmua_filters_cache.get("filters")
+    if filters is None:
+        result = await supabase.rpc("tmua_filters").execute()
+        row = result.data[0] if result.data else {}
+        filters = {
+            "topics": row.get("topics") or [],
+            "sources": row.get("sources") or [],
+        }
+        _tmua_filters_cache["filters"] = filters
+    return filters
+
+
+def invalidate_tmua_filters() -> None:
+    """Drop the cached filter values (called after question imports)."""
+    _tmua_filters_cache.clear()
@@ -0,0 +1,23 @@
+# backend/app/core/http_cache.py
+import hashlib
+
+from fastapi import Request, Response
+
+
+def conditional_response(request: Request, response: Response, payload):
+    """Attach cache headers and honor If-None-Match.
+
+    Browsers and proxies may serve these responses stale for up to a
+    minute while revalidating; an unchanged payload revalidates as a
+    bodyless 304 instead of being re-sent.
+    """
+    etag = f'"{hashlib.blake2b(repr(payload).encode(), digest_size=16).hexdigest()}"'
+    cache_control = "private, max-age=15, stale-while-revalidate=60"
+    if request.headers.get("if-none-match") == etag:
+        return Response(
+            status_code=304,
+            headers={"Cache-Control": cache_control, "ETag": etag},
+        )
+    response.headers["Cache-Control"] = cache_control
+    response.headers["ETag"] = etag
+    return payload
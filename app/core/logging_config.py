@@ -4,8 +4,6 @@ from pathlib import Path
 from loguru import logger
 
 from pydantic import BaseModel
-import json
-from datetime import datetime
 
 # Create logs directory if it doesn't exist
 LOGS_DIR = Path("logs")
@@ -25,6 +23,14 @@ class LogConfig(BaseModel):
     LOG_FILE_INFO: str = str(LOGS_DIR / "info.log")
 
 
+_LOGGING_FILE = logging.__file__
+
+
+# Single shared config instance — building a LogConfig re-runs Pydantic
+# validation, so do it once at import
+_CFG = LogConfig()
+
+
 class InterceptHandler(logging.Handler):
     def emit(self, record):
         # Get corresponding Loguru level if it exists
@@ -33,9 +39,13 @@ class InterceptHandler(logging.Handler):
         except ValueError:
             level = record.levelno
 
-        # Find caller from where originated the logged message
+        # Find caller from where originated the logged message. The walk
+        # is bounded: stdlib logging only ever adds a couple of frames, so
+        # a pathological filename match can't turn this into a deep scan
         frame, depth = logging.currentframe(), 2
-        while frame.f_code.co_filename == logging.__file__:
+        for _ in range(10):
+            if frame is None or frame.f_code.co_filename != _LOGGING_FILE:
+                break
             frame = frame.f_back
             depth += 1
 
@@ -52,39 +62,42 @@ def setup_logging():
     # Add handlers for different log levels
     # Debug logs - Contains all logs
     logger.add(
-        LogConfig().LOG_FILE_DEBUG,
+        _CFG.LOG_FILE_DEBUG,
         rotation="1 day",
         retention="1 week",
-        format=LogConfig().LOG_FORMAT,
+        serialize=True,
         level="DEBUG",
         compression="zip",
+        enqueue=True,
     )
 
     # Info logs - Contains info and above
     logger.add(
-        LogConfig().LOG_FILE_INFO,
+        _CFG.LOG_FILE_INFO,
         rotation="1 day",
         retention="1 month",
-        format=LogConfig().LOG_FORMAT,
+        serialize=True,
         level="INFO",
         compression="zip",
+        enqueue=True,
         filter=lambda record: record["level"].name
         in ["INFO", "WARNING", "ERROR", "CRITICAL"],
     )
 
     # Error logs - Contains only error and critical
     logger.add(
-        LogConfig().LOG_FILE_ERROR,
+        _CFG.LOG_FILE_ERROR,
         rotation="1 day",
         retention="3 months",
-        format=LogConfig().LOG_FORMAT,
+        serialize=True,
         level="ERROR",
         compression="zip",
+        enqueue=True,
         filter=lambda record: record["level"].name in ["ERROR", "CRITICAL"],
     )
 
     # Console output
-    logger.add(sys.stdout, format=LogConfig().LOG_FORMAT, level="INFO", colorize=True)
+    logger.add(sys.stdout, format=_CFG.LOG_FORMAT, level="INFO", colorize=True)
 
     # Intercept standard logging
     logging.basicConfig(handlers=[InterceptHandler()], level=0)
@@ -97,32 +110,9 @@ def setup_logging():
     return logger
 
 
-# Custom JSON formatter for structured logging
-class JsonFormatter:
-    def __init__(self, keywords):
-        self.keywords = keywords
-
-    @staticmethod
-    def format(record):
-        json_record = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "level": record["level"].name,
-            "message": record["message"],
-        }
-
-        # Add extra fields if they exist
-        if record["extra"]:
-            for key, value in record["extra"].items():
-                json_record[key] = value
-
-        # Add exception info if it exists
-        if record["exception"]:
-            json_record["exception"] = str(record["exception"])
-
-        return json.dumps(json_record)
-
-
-# Create a context manager for operation logging
+# Context manager for operation logging. Emits two records (start and
+# end), so reserve it for heavy, infrequent operations like bulk imports
+# — never the per-request path.
 class OperationLogger:
     def __init__(self, operation_name: str, **kwargs):
         self.operation_name = operation_name
@@ -1,22 +1,65 @@
-from supabase import create_client, Client
+import asyncio
+from typing import Optional
+
+import httpx
+from supabase import acreate_client, AsyncClient
+from supabase.lib.client_options import AsyncClientOptions
 from app.config import get_settings
 
 settings = get_settings()
 
+# Process-wide async clients: each worker keeps one httpx connection
+# pool whose keep-alive sockets are reused across requests, so TLS
+# setup is paid per connection, not per request. The async client means
+# DB round-trips await on the event loop directly instead of being
+# shipped to worker threads.
+_client: Optional[AsyncClient] = None
+_admin_client: Optional[AsyncClient] = None
+_client_lock = asyncio.Lock()
 
-def get_supabase() -> Client:
-    """Get Supabase client instance."""
-    supabase: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
-    return supabase
 
+def _client_options() -> AsyncClientOptions:
+    """Connection settings shared by both clients.
 
-async def get_supabase_admin() -> Client:
-    """Get Supabase client instance with admin privileges."""
-    supabase: Client = create_client(
-        settings.SUPABASE_URL, settings.SUPABASE_SERVICE_ROLE_KEY
+    supabase-py 2.x builds its own httpx client internally (a custom
+    pool can't be injected), so only the exposed knobs are tuned here: a
+    bounded PostgREST timeout instead of the 120s default.
+    """
+    return AsyncClientOptions(
+        postgrest_client_timeout=httpx.Timeout(30.0, connect=10.0),
     )
-    try:
-        yield supabase
-    finally:
-        # Cleanup if needed
-        pass
+
+
+async def get_supabase() -> AsyncClient:
+    """Get the shared Supabase client instance (anon key)."""
+    global _client
+    if _client is None:
+        async with _client_lock:
+            if _client is None:
+                _client = await acreate_client(
+                    settings.SUPABASE_URL,
+                    settings.SUPABASE_KEY,
+                    options=_client_options(),
+                )
+    return _client
+
+
+async def get_supabase_admin() -> AsyncClient:
+    """Get the shared Supabase client instance with service-role privileges."""
+    global _admin_client
+    if _admin_client is None:
+        async with _client_lock:
+            if _admin_client is None:
+                _admin_client = await acreate_client(
+                    settings.SUPABASE_URL,
+                    settings.SUPABASE_SERVICE_ROLE_KEY,
+                    options=_client_options(),
+                )
+    return _admin_client
+
+
+def reset_supabase_cache() -> None:
+    """Drop the cached clients so the next call rebuilds them (for tests)."""
+    global _client, _admin_client
+    _client = None
+    _admin_client = None
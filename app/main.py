@@ -1,9 +1,10 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from starlette.responses import JSONResponse
 from app.routers import questions, auth, progress, admin
-from app.core.logging_config import setup_logging, OperationLogger
+from app.core.logging_config import setup_logging
 import time
 from typing import Callable
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -14,66 +15,86 @@ logger = setup_logging()
 
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next: Callable):
+        # Build the URL object and method string once per request —
+        # starlette reconstructs the URL from scope components on access
+        url = request.url
+        method = request.method
+
+        # Health checks are noise; don't pay for logging them at all
+        if url.path == "/health":
+            return await call_next(request)
+
         start_time = time.time()
         response = None
-        with OperationLogger(
-            "http_request",
-            method=request.method,
-            url=str(request.url),
-            client_host=request.client.host if request.client else None,
-        ):
-            try:
-                response = await call_next(request)
-                return response
-            finally:
-                process_time = (time.time() - start_time) * 1000
-                status_code = response.status_code if response else 500
-                logger.info(
-                    "Request processed",
-                    process_time_ms=round(process_time, 2),
-                    status_code=status_code,
-                    method=request.method,
-                    url=str(request.url),
-                )
+        try:
+            response = await call_next(request)
+            return response
+        finally:
+            process_time = (time.time() - start_time) * 1000
+            status_code = response.status_code if response else 500
+            # Successful requests only log at DEBUG; problems stay at INFO
+            log = logger.info if status_code >= 400 else logger.debug
+            log(
+                "Request processed",
+                process_time_ms=round(process_time, 2),
+                status_code=status_code,
+                method=method,
+                url=str(url),
+            )
+
+
+def _assert_no_duplicate_routes(api: FastAPI) -> None:
+    """Fail fast if a router was registered twice.
+
+    Duplicate registrations silently shadow each other and add dispatch
+    overhead, so catch them at startup rather than in production.
+    """
+    seen = set()
+    for route in api.routes:
+        methods = getattr(route, "methods", None) or []
+        for method in methods:
+            key = (method, route.path)
+            if key in seen:
+                raise RuntimeError(f"Duplicate route registered: {method} {route.path}")
+            seen.add(key)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting application")
+    _assert_no_duplicate_routes(v1)
     try:
         yield
     finally:
         logger.info("Shutting down application")
+        # Flush the queued file sinks before the process exits
+        logger.complete()
 
 
-# Create the root app
+# Create the root app; orjson serialises large list responses several
+# times faster than the stdlib encoder
 app = FastAPI(
     title="TMUA Guide API",
     description="TMUA Guide API",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Create v1 sub-application
 v1 = FastAPI(
-    title="TMUA Guide API", description="Version 1 of TMUA Guide API", version="1.0.0"
-)
-
-# Add middleware to v1
-v1.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    title="TMUA Guide API",
+    description="Version 1 of TMUA Guide API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
-# Add routers to v1
-
 # Mount v1 to main app
 app.mount("/api/v1", v1)
 
-# Add middleware to main app
+# Middleware on the root app covers mounted sub-apps too; CORS is added
+# last so it runs outermost and short-circuited OPTIONS requests are
+# never logged
 app.add_middleware(RequestLoggingMiddleware)
 
 app.add_middleware(
@@ -1,15 +1,30 @@
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException, File, UploadFile
 from app.core.auth import check_roles, UserRole
-from app.core.logging_config import logger
+from app.core.cache import invalidate_tmua_filters
+from app.config import get_settings
+from app.core.logging_config import logger, OperationLogger
 from app.db import get_supabase
-from supabase import Client
+from supabase import AsyncClient
 from typing import List, Optional
 from pydantic import BaseModel
-import pandas as pd
-from datetime import datetime, timedelta
+from openpyxl import load_workbook
+from datetime import datetime
 
 router = APIRouter()
 
+# Spreadsheet header -> TMUA column (header typos match the template in use)
+EXCEL_COLUMN_MAP = {
+    "Serial No": "ques_number",
+    "QUESTION": "question",
+    "Options": "options",
+    "TAG": "topic",
+    "Difiiculty tag": "difficulty",
+    "Source": "source",
+    "Correct option": "correct_answer",
+}
+
 
 class UserStats(BaseModel):
     user_id: str
@@ -29,39 +44,33 @@ class UserUpdate(BaseModel):
 @router.get("/users", response_model=List[UserStats])
 async def get_all_users(
     current_user: dict = Depends(check_roles([UserRole.ADMIN])),
-    supabase: Client = Depends(get_supabase),
+    supabase: AsyncClient = Depends(get_supabase),
 ):
     """Get statistics for all users"""
     try:
-        # Get all users from auth
-        users = supabase.auth.admin.list_users()
-
-        # Get progress data for all users
-        progress = supabase.table("user_progress").select("*").execute()
+        # profiles is a trigger-synced shadow of auth.users (see the
+        # profiles migration) — an indexed select instead of paging the
+        # whole GoTrue admin API. The summary RPC returns one grouped
+        # row per user, so both queries are O(users) and independent.
+        users, summary = await asyncio.gather(
+            supabase.table("profiles").select("user_id,email,name,role").execute(),
+            supabase.rpc("user_progress_summary").execute(),
+        )
+        aggregates = {row["user_id"]: row for row in summary.data}
 
+        empty = {"total_attempts": 0, "correct_attempts": 0, "last_active": None}
         user_stats = []
-        for user in users:
-            # Filter progress for this user
-            user_progress = [p for p in progress.data if p["user_id"] == user.id]
-
-            # Calculate stats
-            total_attempts = len(user_progress)
-            correct_attempts = len([p for p in user_progress if p["is_correct"]])
-            last_active = (
-                max([p["attempted_at"] for p in user_progress])
-                if user_progress
-                else None
-            )
-
+        for user in users.data:
+            stats = aggregates.get(user["user_id"], empty)
             user_stats.append(
                 UserStats(
-                    user_id=user.id,
-                    email=user.email,
-                    name=user.user_metadata.get("name"),
-                    role=user.user_metadata.get("role", "student"),
-                    total_attempts=total_attempts,
-                    correct_attempts=correct_attempts,
-                    last_active=last_active,
+                    user_id=user["user_id"],
+                    email=user["email"],
+                    name=user["name"],
+                    role=user["role"] or "student",
+                    total_attempts=stats["total_attempts"],
+                    correct_attempts=stats["correct_attempts"],
+                    last_active=stats["last_active"],
                 )
             )
 
@@ -76,7 +85,7 @@ async def update_user(
     user_id: str,
     user_update: UserUpdate,
     current_user: dict = Depends(check_roles([UserRole.ADMIN])),
-    supabase: Client = Depends(get_supabase),
+    supabase: AsyncClient = Depends(get_supabase),
 ):
     """Update user role or status"""
     try:
@@ -85,8 +94,9 @@ async def update_user(
             update_data["role"] = user_update.role
 
         if update_data:
+            # The auth.users trigger syncs the change into profiles
             await supabase.auth.admin.update_user_by_id(
-                user_id, user_metadata=update_data
+                user_id, {"user_metadata": update_data}
             )
 
         return {"message": "User updated successfully"}
@@ -99,14 +109,16 @@ async def update_user(
 async def delete_user(
     user_id: str,
     current_user: dict = Depends(check_roles([UserRole.ADMIN])),
-    supabase: Client = Depends(get_supabase),
+    supabase: AsyncClient = Depends(get_supabase),
 ):
     """Delete a user and their data"""
     try:
         # Delete user's progress first
-        await supabase.table("user_progress").delete().eq("user_id", user_id).execute()
+        await (
+            supabase.table("user_progress").delete().eq("user_id", user_id).execute()
+        )
 
-        # Delete user from auth
+        # Delete user from auth; the profiles row cascades with it
         await supabase.auth.admin.delete_user(user_id)
 
         return {"message": "User and associated data deleted successfully"}
@@ -118,29 +130,42 @@ async def delete_user(
 @router.get("/stats/system")
 async def get_system_stats(
     current_user: dict = Depends(check_roles([UserRole.ADMIN])),
-    supabase: Client = Depends(get_supabase),
+    supabase: AsyncClient = Depends(get_supabase),
 ):
     """Get overall system statistics"""
     try:
         # Get counts
-        users = len(supabase.auth.admin.list_users())
-        questions = supabase.table("TMUA").select("*", count="exact").execute()
-        attempts = supabase.table("user_progress").select("*", count="exact").execute()
-
-        # Get recent activity
-        recent_attempts = (
+        # All four lookups are independent; run them concurrently.
+        # head=True returns only the count header — no rows cross the
+        # wire — and weekly activity is aggregated server-side (see the
+        # weekly_stats migration)
+        # count="estimated" reads pg_class.reltuples (O(1)) rather than
+        # scanning; dashboard totals don't need to be row-exact
+        users_count, questions, attempts, weekly = await asyncio.gather(
+            supabase.table("profiles")
+            .select("user_id", count="exact", head=True)
+            .execute(),
+            supabase.table("TMUA")
+            .select("ques_number", count="estimated", head=True)
+            .execute(),
             supabase.table("user_progress")
-            .select("*")
-            .gte("attempted_at", (datetime.now() - timedelta(days=7)).isoformat())
-            .execute()
+            .select("id", count="estimated", head=True)
+            .execute(),
+            supabase.rpc("weekly_stats").execute(),
+        )
+        users = users_count.count
+        weekly_row = (
+            weekly.data[0]
+            if weekly.data
+            else {"weekly_attempts": 0, "weekly_active_users": 0}
         )
 
         return {
             "total_users": users,
             "total_questions": questions.count,
             "total_attempts": attempts.count,
-            "weekly_active_users": len(set(a["user_id"] for a in recent_attempts.data)),
-            "weekly_attempts": len(recent_attempts.data),
+            "weekly_active_users": weekly_row["weekly_active_users"],
+            "weekly_attempts": weekly_row["weekly_attempts"],
         }
     except Exception as e:
         logger.error(f"Error fetching system stats: {str(e)}")
@@ -151,49 +176,173 @@ async def get_system_stats(
 async def bulk_upload_questions(
     file: UploadFile = File(...),
     current_user: dict = Depends(check_roles([UserRole.ADMIN])),
-    supabase: Client = Depends(get_supabase),
+    supabase: AsyncClient = Depends(get_supabase),
 ):
     """Bulk upload questions from Excel with validation"""
     try:
-        df = pd.read_excel(file.file)
-        valid_records = []
-        errors = []
-
-        for index, row in df.iterrows():
-            try:
-                # Validate record
-                question = {
-                    "ques_number": int(row["Serial No"]),
-                    "question": str(row["QUESTION"]),
-                    "options": str(row["Options"]),
-                    "solution": str(row["Correct option"]),
-                    "topic": str(row["TAG"]),
-                    "difficulty": str(row["Difiiculty tag"]),
-                    "source": str(row["Source"]),
-                    "q_type": int(row.get("q_type", 0)),
-                    "correct_answer": str(row["Correct option"]),
-                }
-                valid_records.append(question)
-            except Exception as e:
-                errors.append(f"Row {index + 2}: {str(e)}")
-
-        if errors:
+        with OperationLogger("bulk_upload", filename=file.filename):
+            return await _import_excel(file, supabase)
+    except Exception as e:
+        logger.error(f"Error in bulk upload: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/validate-excel")
+async def validate_excel(
+    file: UploadFile = File(...),
+    current_user: dict = Depends(check_roles([UserRole.ADMIN])),
+):
+    """Check an upload's columns and size without importing it.
+
+    Only the header and the first data row are materialised — openpyxl's
+    read-only mode reports the row count without parsing cell values, so
+    validation is O(1) in workbook size.
+    """
+    try:
+        await file.seek(0)
+        headers, total_rows, sample = await asyncio.to_thread(
+            _inspect_excel, file.file
+        )
+
+        missing_columns = _missing_columns(headers)
+        if missing_columns:
             return {
-                "status": "partial_success" if valid_records else "failed",
-                "errors": errors,
-                "valid_count": len(valid_records),
+                "valid": False,
+                "errors": [f"Missing columns: {', '.join(missing_columns)}"],
+                "total_rows": total_rows,
             }
 
-        # Insert valid records
-        for batch in [
-            valid_records[i : i + 50] for i in range(0, len(valid_records), 50)
-        ]:
-            supabase.table("TMUA").insert(batch).execute()
+        return {"valid": True, "total_rows": total_rows, "sample": sample}
+    except Exception as e:
+        logger.error(f"Error validating Excel file: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _normalized_headers(headers) -> dict:
+    """Map lowercased, stripped header names to the originals.
+
+    One set-style lookup per required column, and tolerant of case or
+    whitespace drift in the source spreadsheet (the known
+    "Difiiculty tag" typo can be fixed there without breaking old files).
+    """
+    return {str(h).strip().lower(): h for h in headers}
 
+
+def _missing_columns(headers) -> list:
+    header_map = _normalized_headers(headers)
+    return [c for c in EXCEL_COLUMN_MAP if c.strip().lower() not in header_map]
+
+
+def _inspect_excel(fileobj):
+    """Read the header row, row count and first data row of a workbook."""
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        sheet = workbook.active
+        rows = sheet.iter_rows(values_only=True)
+        headers = [cell for cell in next(rows, ()) if cell is not None]
+        first_row = next(rows, None)
+        sample = dict(zip(headers, first_row)) if first_row else None
+        total_rows = max((sheet.max_row or 1) - 1, 0)
+        return headers, total_rows, sample
+    finally:
+        workbook.close()
+
+
+async def _import_excel(file: UploadFile, supabase: AsyncClient):
+    # Deferred import: pandas costs ~150MB RSS and noticeable startup
+    # time, and only the import path needs it
+    import pandas as pd
+
+    # Starlette already spools large uploads to a temp file, so hand
+    # that file object straight to the parser instead of copying the
+    # whole workbook into memory first. Parsing stays on a worker
+    # thread — openpyxl is CPU-bound and can take seconds for large
+    # workbooks.
+    await file.seek(0)
+    df = await asyncio.to_thread(pd.read_excel, file.file)
+
+    missing_columns = _missing_columns(df.columns)
+    if missing_columns:
         return {
-            "status": "success",
-            "message": f"Successfully imported {len(valid_records)} questions",
+            "status": "failed",
+            "errors": [f"Missing columns: {', '.join(missing_columns)}"],
+            "valid_count": 0,
         }
-    except Exception as e:
-        logger.error(f"Error in bulk upload: {str(e)}")
-        raise HTTPException(status_code=400, detail=str(e))
+
+    header_map = _normalized_headers(df.columns)
+    df = df.rename(
+        columns={
+            header_map[excel_name.strip().lower()]: column
+            for excel_name, column in EXCEL_COLUMN_MAP.items()
+        }
+    )
+
+    # Coerce columnwise instead of per-row int()/str() calls
+    df["ques_number"] = pd.to_numeric(df["ques_number"], errors="coerce")
+    if "q_type" in df.columns:
+        df["q_type"] = (
+            pd.to_numeric(df["q_type"], errors="coerce").fillna(0).astype(int)
+        )
+    else:
+        df["q_type"] = 0
+    for column in ("question", "options", "topic", "difficulty", "source"):
+        df[column] = df[column].astype(str)
+    df["correct_answer"] = df["correct_answer"].astype(str)
+    df["solution"] = df["correct_answer"]
+
+    # Rows with a non-numeric question number are reported in one pass
+    invalid_mask = df["ques_number"].isna()
+    errors = [
+        f"Row {index + 2}: invalid question number"
+        for index in df.index[invalid_mask]
+    ]
+    df = df.loc[~invalid_mask]
+    df["ques_number"] = df["ques_number"].astype(int)
+
+    valid_records = df[
+        [
+            "ques_number",
+            "question",
+            "options",
+            "solution",
+            "topic",
+            "difficulty",
+            "source",
+            "q_type",
+            "correct_answer",
+        ]
+    ].to_dict(orient="records")
+
+    if errors:
+        return {
+            "status": "partial_success" if valid_records else "failed",
+            "errors": errors,
+            "valid_count": len(valid_records),
+        }
+
+    # Insert valid records; batches go out concurrently so wall time is
+    # max(batch latency), not the sum. Batch size is tunable per deploy
+    # (IMPORT_BATCH_SIZE) — Postgres ingest plateaus around 1k rows per
+    # statement, and fewer statements means fewer HTTP round-trips. The
+    # semaphore keeps a huge workbook from opening one connection per
+    # batch all at once.
+    batch_size = get_settings().IMPORT_BATCH_SIZE
+    batches = [
+        valid_records[i : i + batch_size]
+        for i in range(0, len(valid_records), batch_size)
+    ]
+    insert_sem = asyncio.Semaphore(8)
+
+    async def _insert(batch):
+        async with insert_sem:
+            return await supabase.table("TMUA").insert(batch).execute()
+
+    await asyncio.gather(*[_insert(b) for b in batches])
+
+    # New questions change the cached filter values
+    invalidate_tmua_filters()
+
+    return {
+        "status": "success",
+        "message": f"Successfully imported {len(valid_records)} questions",
+    }
@@ -1,9 +1,8 @@
 # auth.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, EmailStr
-from typing import Optional
 from app.db import get_supabase
-from supabase import Client
+from supabase import AsyncClient
 
 router = APIRouter()
 
@@ -23,16 +22,16 @@ class UserResponse(BaseModel):
     stats: dict  # For storing solving statistics
 
 @router.post("/signup")
-async def signup(user_data: UserCreate, supabase: Client = Depends(get_supabase)):
+async def signup(user_data: UserCreate, supabase: AsyncClient = Depends(get_supabase)):
     """Simple signup with email/password"""
     try:
-        auth_response = supabase.auth.sign_up({
-            "email": user_data.email,
-            "password": user_data.password,
-            "options": {
-                "data": {"name": user_data.name}
+        auth_response = await supabase.auth.sign_up(
+            {
+                "email": user_data.email,
+                "password": user_data.password,
+                "options": {"data": {"name": user_data.name}},
             }
-        })
+        )
         return {
             "message": "Signup successful",
             "user": auth_response.user
@@ -41,16 +40,15 @@ async def signup(user_data: UserCreate, supabase: Client = Depends(get_supabase)
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/login")
-async def login(credentials: UserLogin, supabase: Client = Depends(get_supabase)):
+async def login(credentials: UserLogin, supabase: AsyncClient = Depends(get_supabase)):
     """Simple login with email/password"""
     try:
-        auth_response = supabase.auth.sign_in_with_password({
-            "email": credentials.email,
-            "password": credentials.password
-        })
+        auth_response = await supabase.auth.sign_in_with_password(
+            {"email": credentials.email, "password": credentials.password}
+        )
         return {
             "access_token": auth_response.session.access_token,
             "user": auth_response.user
         }
-    except Exception as e:
+    except Exception:
         raise HTTPException(status_code=401, detail="Invalid credentials")
\ No newline at end of file
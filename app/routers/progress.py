@@ -1,11 +1,14 @@
 # progress.py
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from app.db import get_supabase
 from app.core.auth import get_current_user
-from supabase import Client
-from pydantic import BaseModel
-from datetime import datetime
+from app.core.cache import stats_cache, invalidate_user_stats
+from app.core.http_cache import conditional_response
+from supabase import AsyncClient
+from pydantic import BaseModel, ConfigDict
+from typing import List
+from datetime import datetime, timedelta, timezone
 
 router = APIRouter()
 
@@ -15,55 +18,361 @@ class AttemptCreate(BaseModel):
     time_taken: int
     is_correct: bool
 
-@router.post("/attempt")
+class ProgressResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    user_id: str
+    question_id: int
+    selected_answer: str
+    time_taken: int
+    is_correct: bool
+    attempted_at: datetime
+
+
+class _AttemptBatcher:
+    """Coalesces attempt writes that arrive close together.
+
+    A quiz session fires one POST per answered question; each submit
+    waits a short window so concurrent attempts collapse into a single
+    bulk upsert (unique on user_id+question_id), cutting a 20-question
+    burst from 20 round-trips to 1. Every caller still gets back its own
+    inserted row via a per-item future.
+    """
+
+    def __init__(self, max_delay: float = 0.05):
+        self.max_delay = max_delay
+        self._pending = []
+        self._task = None
+
+    async def submit(self, supabase: AsyncClient, row: dict) -> dict:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((row, future))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._drain(supabase))
+        return await future
+
+    async def _drain(self, supabase: AsyncClient):
+        # Keep flushing until nothing is pending: submits that arrive
+        # while an upsert is in flight land in a fresh _pending list that
+        # this task must still pick up — exiting early would strand them
+        # (and their futures) until some later request scheduled a drain.
+        while self._pending:
+            await asyncio.sleep(self.max_delay)
+            items, self._pending = self._pending, []
+            # Last write wins per key: a double-click can put the same
+            # (user_id, question_id) in one window twice, and Postgres
+            # rejects an upsert that touches a row a second time. Every
+            # duplicate's future still resolves via the shared key below.
+            latest = {}
+            for row, _ in items:
+                latest[(row["user_id"], row["question_id"])] = row
+            rows = list(latest.values())
+            try:
+                response = await (
+                    supabase.table("user_progress")
+                    .upsert(rows, on_conflict="user_id,question_id")
+                    .execute()
+                )
+                returned = {
+                    (r["user_id"], r["question_id"]): r for r in response.data
+                }
+                for row, future in items:
+                    future.set_result(
+                        returned.get((row["user_id"], row["question_id"]), row)
+                    )
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+
+
+_attempt_batcher = _AttemptBatcher()
+
+
+@router.post("/attempt", response_model=ProgressResponse)
 async def record_attempt(
     attempt: AttemptCreate,
     current_user: dict = Depends(get_current_user),
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     """Record or update a question attempt"""
     try:
-        # Check for existing attempt
-        existing = supabase.table("user_progress")\
-            .select("id")\
-            .eq("user_id", current_user.id)\
-            .eq("question_id", attempt.question_id)\
-            .execute()
-
         data = {
             "user_id": current_user.id,
-            **attempt.dict(),
-            "attempted_at": datetime.now().isoformat()
+            **attempt.model_dump(),
+            "attempted_at": datetime.now(timezone.utc).isoformat()
         }
 
-        if existing.data:
-            # Update existing attempt
-            response = supabase.table("user_progress")\
-                .update(data)\
-                .eq("id", existing.data[0]["id"])\
-                .execute()
-        else:
-            # Create new attempt
-            response = supabase.table("user_progress")\
-                .insert(data)\
-                .execute()
-
-        return response.data[0]
+        # One upsert replaces the old select-then-insert/update pair, and
+        # the batcher folds concurrent attempts into a single request
+        row = await _attempt_batcher.submit(supabase, data)
+
+        # A new attempt changes every cached stat for this user
+        invalidate_user_stats(str(current_user.id))
+        return ProgressResponse.model_validate(row)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/attempts/bulk", response_model=List[ProgressResponse])
+async def record_attempts_bulk(
+    attempts: List[AttemptCreate],
+    current_user: dict = Depends(get_current_user),
+    supabase: AsyncClient = Depends(get_supabase)
+):
+    """Record a batch of attempts in one request.
+
+    Clients that sync a whole quiz session at once (e.g. after coming
+    back online) post the list here: one multi-row upsert instead of one
+    round-trip per answer.
+    """
+    try:
+        # Last attempt wins per question: an offline session can contain
+        # a retried question, and Postgres rejects an upsert that
+        # touches the same row twice
+        latest = {attempt.question_id: attempt for attempt in attempts}
+
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [
+            {
+                "user_id": current_user.id,
+                **attempt.model_dump(),
+                "attempted_at": now,
+            }
+            for attempt in latest.values()
+        ]
+
+        response = await (
+            supabase.table("user_progress")
+            .upsert(rows, on_conflict="user_id,question_id")
+            .execute()
+        )
+
+        invalidate_user_stats(str(current_user.id))
+        return [ProgressResponse.model_validate(row) for row in response.data]
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/stats")
+async def get_user_stats(
+    request: Request,
+    response: Response,
+    time_range: str = Query("all", description="all, week or month"),
+    current_user: dict = Depends(get_current_user),
+    supabase: AsyncClient = Depends(get_supabase)
+):
+    """Get overall attempt totals and accuracy for the current user"""
+    try:
+        cache_key = f"{current_user.id}:stats:{time_range}"
+        cached = stats_cache.get(cache_key)
+        if cached is not None:
+            return conditional_response(request, response, cached)
+
+        since = None
+        if time_range == "week":
+            since = datetime.now(timezone.utc) - timedelta(days=7)
+        elif time_range == "month":
+            since = datetime.now(timezone.utc) - timedelta(days=30)
+
+        # One RPC returns both counters via COUNT(*) FILTER — no second
+        # round-trip for the correct count
+        result = await supabase.rpc(
+            "stats_for_user",
+            {
+                "uid": str(current_user.id),
+                "since": since.isoformat() if since else None,
+            },
+        ).execute()
+
+        row = result.data[0] if result.data else {"total": 0, "correct": 0}
+        total = row["total"]
+        correct = row["correct"]
+
+        payload = {
+            "total_attempts": total,
+            "correct_attempts": correct,
+            "accuracy": round(correct / total * 100, 1) if total else 0,
+        }
+        stats_cache[cache_key] = payload
+        return conditional_response(request, response, payload)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/topic-progress")
+async def get_topic_progress(
+    request: Request,
+    response: Response,
+    current_user: dict = Depends(get_current_user),
+    supabase: AsyncClient = Depends(get_supabase)
+):
+    """Get per-topic accuracy for the current user.
+
+    Aggregation happens in Postgres (get_topic_progress RPC), so the
+    response is one row per topic regardless of how many attempts the
+    user has made.
+    """
+    try:
+        cache_key = f"{current_user.id}:topic-progress"
+        cached = stats_cache.get(cache_key)
+        if cached is not None:
+            return conditional_response(request, response, cached)
+
+        result = await supabase.rpc(
+            "get_topic_progress", {"uid": str(current_user.id)}
+        ).execute()
+
+        payload = [
+            {
+                "topic": row["topic"],
+                "total_attempts": row["total_attempts"],
+                "correct_attempts": row["correct_attempts"],
+                "accuracy": round(
+                    row["correct_attempts"] / row["total_attempts"] * 100, 1
+                )
+                if row["total_attempts"]
+                else 0,
+                "average_time": row["average_time"],
+            }
+            for row in result.data
+        ]
+        stats_cache[cache_key] = payload
+        return conditional_response(request, response, payload)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/difficulty-progress")
+async def get_difficulty_progress(
+    request: Request,
+    response: Response,
+    current_user: dict = Depends(get_current_user),
+    supabase: AsyncClient = Depends(get_supabase)
+):
+    """Get per-difficulty accuracy for the current user.
+
+    The difficulty lives on TMUA, not user_progress, so the join and
+    GROUP BY run in Postgres (get_difficulty_progress RPC).
+    """
+    try:
+        cache_key = f"{current_user.id}:difficulty-progress"
+        cached = stats_cache.get(cache_key)
+        if cached is not None:
+            return conditional_response(request, response, cached)
+
+        result = await supabase.rpc(
+            "get_difficulty_progress", {"uid": str(current_user.id)}
+        ).execute()
+
+        payload = [
+            {
+                "difficulty": row["difficulty"],
+                "total_attempts": row["total_attempts"],
+                "correct_attempts": row["correct_attempts"],
+                "accuracy": round(
+                    row["correct_attempts"] / row["total_attempts"] * 100, 1
+                )
+                if row["total_attempts"]
+                else 0,
+                "average_time": row["average_time"],
+            }
+            for row in result.data
+        ]
+        stats_cache[cache_key] = payload
+        return conditional_response(request, response, payload)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/daily-streak")
+async def get_daily_streak(
+    request: Request,
+    response: Response,
+    tz: str = Query("UTC", description="IANA timezone for day boundaries"),
+    current_user: dict = Depends(get_current_user),
+    supabase: AsyncClient = Depends(get_supabase)
+):
+    """Get the user's current and longest daily practice streaks.
+
+    Computed with a gap-and-islands window query in Postgres
+    (get_streaks RPC) — the API never sees individual timestamps. Day
+    boundaries follow the caller's timezone so "today" matches the
+    user's clock, not the server's.
+    """
+    try:
+        cache_key = f"{current_user.id}:daily-streak:{tz}"
+        cached = stats_cache.get(cache_key)
+        if cached is not None:
+            return conditional_response(request, response, cached)
+
+        result = await supabase.rpc(
+            "get_streaks", {"uid": str(current_user.id), "tz": tz}
+        ).execute()
+
+        row = (
+            result.data[0]
+            if result.data
+            else {"current_streak": 0, "longest_streak": 0}
+        )
+        payload = {
+            "current_streak": row["current_streak"],
+            "longest_streak": row["longest_streak"],
+        }
+        stats_cache[cache_key] = payload
+        return conditional_response(request, response, payload)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/performance-timeline")
+async def get_performance_timeline(
+    request: Request,
+    response: Response,
+    days: int = Query(30, ge=1, le=365, description="Days of history"),
+    current_user: dict = Depends(get_current_user),
+    supabase: AsyncClient = Depends(get_supabase)
+):
+    """Get daily attempt/accuracy buckets for the last N days.
+
+    Postgres buckets by day (perf_timeline RPC), so the payload scales
+    with the number of active days, not the number of attempts.
+    """
+    try:
+        cache_key = f"{current_user.id}:timeline:{days}"
+        cached = stats_cache.get(cache_key)
+        if cached is not None:
+            return conditional_response(request, response, cached)
+
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).date()
+        result = await supabase.rpc(
+            "perf_timeline",
+            {"uid": str(current_user.id), "since": since.isoformat()},
+        ).execute()
+
+        payload = [
+            {
+                "date": row["day"],
+                "attempts": row["attempts"],
+                "correct": row["correct"],
+                "accuracy": round(row["correct"] / row["attempts"] * 100, 1)
+                if row["attempts"]
+                else 0,
+            }
+            for row in result.data
+        ]
+        stats_cache[cache_key] = payload
+        return conditional_response(request, response, payload)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/profile")
 async def get_profile(
     current_user: dict = Depends(get_current_user),
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     """Get user profile with stats as shown in the profile screen"""
     try:
-        # Get attempts by difficulty
-        attempts = supabase.table("user_progress")\
-            .select("*, TMUA!inner(*)")\
-            .eq("user_id", current_user.id)\
-            .execute()
+        # Per-difficulty totals come back pre-aggregated (<= 3 rows)
+        # instead of one joined row per attempt
+        result = await supabase.rpc(
+            "profile_stats", {"uid": str(current_user.id)}
+        ).execute()
 
         stats = {
             "easy": {"total": 0, "correct": 0},
@@ -71,13 +380,14 @@ async def get_profile(
             "hard": {"total": 0, "correct": 0}
         }
 
-        for attempt in attempts.data:
-            difficulty = attempt["TMUA"]["difficulty"].lower()
-            stats[difficulty]["total"] += 1
-            if attempt["is_correct"]:
-                stats[difficulty]["correct"] += 1
+        for row in result.data:
+            if row["difficulty"] in stats:
+                stats[row["difficulty"]] = {
+                    "total": row["total"],
+                    "correct": row["correct"],
+                }
 
-        solved_count = len(attempts.data)
+        solved_count = sum(row["total"] for row in result.data)
 
         return {
             "user": {
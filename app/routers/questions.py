@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse
 from typing import Optional, List
 from enum import Enum
-import math
 from app.db import get_supabase
 from app.core.auth import get_current_user
-from supabase import Client
+from app.core.cache import get_tmua_filters
+from app.core.http_cache import conditional_response
+from app.core.logging_config import logger
+from supabase import AsyncClient
 from app.schemas.pagination import PaginatedResponse
 from pydantic import BaseModel
 
@@ -30,92 +33,50 @@ class QuestionResponse(BaseModel):
 async def get_questions(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=50, description="Questions per page"),
+    after: Optional[int] = Query(
+        None, description="Keyset cursor: return questions after this ques_number"
+    ),
     difficulty: Optional[str] = None,
     topic: Optional[str] = None,
     source: Optional[str] = None,
     status: List[QuestionStatus] = Query(None, description="Filter by multiple statuses"),
     current_user: dict = Depends(get_current_user),
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     try:
-        # Get user's attempts first
-        attempts = supabase.table("user_progress")\
-            .select("question_id, is_correct")\
-            .eq("user_id", current_user.id)\
-            .execute()
-
-        # If status includes correct/incorrect but no attempts exist, return empty result
-        if status and (QuestionStatus.CORRECT in status or QuestionStatus.INCORRECT in status) and not attempts.data:
-            return PaginatedResponse(
-                items=[],
-                total=0,
-                page=page,
-                size=size,
-                total_pages=0,
-                has_next=False,
-                has_previous=False,
-                next_page=None,
-                previous_page=None
-            )
+        # A cursor supersedes the page number: the SQL function seeks
+        # past it with an index range scan, so deep pagination costs the
+        # same as page one
+        if after is not None:
+            page = 1
 
-        # Create lookups
-        attempt_lookup = {
-            a["question_id"]: "correct" if a["is_correct"] else "incorrect"
-            for a in attempts.data
-        }
+        # One RPC does everything the old flow needed four queries and an
+        # id fan-out for: the questions_with_status SQL function joins
+        # each TMUA row to the caller's attempt, computes its status,
+        # applies every filter, pages, and returns the filtered total as
+        # a window count on each row
+        result = await supabase.rpc(
+            "questions_with_status",
+            {
+                "uid": str(current_user.id),
+                "p_difficulty": difficulty,
+                "p_topic": topic,
+                "p_source": source,
+                "statuses": [s.value for s in status] if status else None,
+                "page_limit": size,
+                "page_offset": (page - 1) * size,
+                "p_after": after,
+            },
+        ).execute()
 
-        attempted_ids = list(attempt_lookup.keys())
-        correct_ids = [qid for qid, stat in attempt_lookup.items() if stat == "correct"]
-        incorrect_ids = [qid for qid, stat in attempt_lookup.items() if stat == "incorrect"]
-
-        # Build query
-        query = supabase.table("TMUA").select("*", count="exact")
-
-        # Apply basic filters
-        if difficulty:
-            query = query.eq("difficulty", difficulty)
-        if topic:
-            query = query.eq("topic", topic)
-        if source:
-            query = query.eq("source", source)
-
-        # Apply status filters if provided
-        if status:
-            filter_ids = set()
-            has_status_filter = False
-
-            for stat in status:
-                if stat == QuestionStatus.CORRECT and correct_ids:
-                    filter_ids.update(correct_ids)
-                    has_status_filter = True
-                elif stat == QuestionStatus.INCORRECT and incorrect_ids:
-                    filter_ids.update(incorrect_ids)
-                    has_status_filter = True
-
-            # Handle unattempted status
-            if QuestionStatus.UNATTEMPTED in status:
-                if filter_ids:
-                    # Include both filter_ids and unattempted questions
-                    query = query.or_(
-                        f'ques_number.in.({",".join(map(str, filter_ids))}),'
-                        f'ques_number.not.in.({",".join(map(str, attempted_ids))})'
-                    )
-                else:
-                    # Only unattempted questions
-                    query = query.not_.in_("ques_number", attempted_ids)
-            elif has_status_filter:
-                # Only include questions with matching correct/incorrect status
-                query = query.in_("ques_number", list(filter_ids))
-
-        # Calculate pagination
-        offset = (page - 1) * size
-
-        # Get total count and questions
-        total_result = query.execute()
-        total_count = total_result.count if hasattr(total_result, "count") else 0
+        total_count = result.data[0]["total"] if result.data else 0
+        questions_with_status = [
+            {key: value for key, value in row.items() if key != "total"}
+            for row in result.data
+        ]
 
         if total_count == 0:
-            return PaginatedResponse(
+            payload = PaginatedResponse[QuestionResponse](
                 items=[],
                 total=0,
                 page=page,
@@ -126,26 +87,19 @@ async def get_questions(
                 next_page=None,
                 previous_page=None
             )
-
-        # Get page of questions
-        query = query.range(offset, offset + size - 1).order("ques_number")
-        questions_result = query.execute()
-
-        # Add status to each question
-        questions_with_status = []
-        for question in questions_result.data:
-            question_data = dict(question)
-            question_data["status"] = attempt_lookup.get(
-                question["ques_number"], "unattempted"
-            )
-            questions_with_status.append(question_data)
+            return ORJSONResponse(payload.model_dump(mode="json"))
 
         # Calculate pagination metadata
-        total_pages = math.ceil(total_count / size)
+        total_pages = (total_count + size - 1) // size
         has_next = page < total_pages
         has_previous = page > 1
 
-        return PaginatedResponse(
+        # The RPC returns rows already in response shape, so skip the
+        # per-row validation pass entirely and serialise straight to
+        # orjson — returning a model would make FastAPI re-validate
+        # every row against the response_model
+        payload = PaginatedResponse.trusted(
+            item_cls=QuestionResponse,
             items=questions_with_status,
             total=total_count,
             page=page,
@@ -154,8 +108,10 @@ async def get_questions(
             has_next=has_next,
             has_previous=has_previous,
             next_page=page + 1 if has_next else None,
-            previous_page=page - 1 if has_previous else None
+            previous_page=page - 1 if has_previous else None,
+            next_cursor=questions_with_status[-1]["ques_number"] if has_next else None,
         )
+        return ORJSONResponse(payload.model_dump(mode="json"))
 
     except Exception as e:
         logger.error(f"Error fetching questions: {str(e)}")
@@ -164,19 +120,130 @@ async def get_questions(
 
 @router.get("/filters")
 async def get_filters(
+    request: Request,
+    response: Response,
     current_user: dict = Depends(get_current_user),
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     """Get available filters for the study plan"""
     try:
-        topics = supabase.table("TMUA").select("topic").execute()
-        sources = supabase.table("TMUA").select("source").execute()
+        # One cached DISTINCT query — no table scan or Python dedupe
+        # per request; unchanged payloads revalidate as a 304
+        filters = await get_tmua_filters(supabase)
 
-        return {
-            "topics": sorted(set(t["topic"] for t in topics.data)),
+        payload = {
+            "topics": filters["topics"],
             "difficulties": ["Easy", "Medium", "Hard"],
-            "sources": sorted(set(s["source"] for s in sources.data))
+            "sources": filters["sources"]
         }
+        return conditional_response(request, response, payload)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/search")
+async def search_questions(
+    q: str = Query(..., min_length=2, description="Search terms"),
+    limit: int = Query(20, ge=1, le=50, description="Maximum results"),
+    fields: Optional[str] = Query(
+        None,
+        pattern=r"^[a-z_]+(,[a-z_]+)*$",
+        description="Comma-separated columns to return",
+    ),
+    current_user: dict = Depends(get_current_user),
+    supabase: AsyncClient = Depends(get_supabase)
+):
+    """Full-text search over question bodies.
+
+    Matches against the stored question_tsv column, so the GIN index
+    serves the query instead of re-parsing every row. A table view that
+    only needs ques_number and topic can project them with ?fields= and
+    skip the heavyweight question text entirely.
+    """
+    try:
+        columns = fields or "ques_number,question,options,topic,difficulty,source,image"
+        result = await (
+            supabase.table("TMUA")
+            .select(columns)
+            .text_search("question_tsv", q, options={"type": "web_search"})
+            .order("ques_number")
+            .limit(limit)
+            .execute()
+        )
+
+        return {"count": len(result.data), "results": result.data}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/random")
+async def get_random_question(
+    difficulty: Optional[str] = None,
+    topic: Optional[str] = None,
+    source: Optional[str] = None,
+    exclude_attempted: bool = Query(True, description="Skip questions already attempted"),
+    current_user: dict = Depends(get_current_user),
+    supabase: AsyncClient = Depends(get_supabase)
+):
+    """Get a random question matching the filters.
+
+    The random pick and the exclude-attempted anti-join both run in
+    Postgres (random_question RPC), so the request is constant-size no
+    matter how many questions the user has attempted.
+    """
+    try:
+        result = await supabase.rpc(
+            "random_question",
+            {
+                "uid": str(current_user.id),
+                "p_difficulty": difficulty,
+                "p_topic": topic,
+                "p_source": source,
+                "exclude_attempted": exclude_attempted,
+            },
+        ).execute()
+
+        if not result.data:
+            raise HTTPException(
+                status_code=404, detail="No questions match the given filters"
+            )
+
+        return result.data[0]
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/practice-set")
+async def generate_practice_set(
+    count: int = Query(10, ge=1, le=50, description="Questions in the set"),
+    difficulty: Optional[str] = None,
+    topic: Optional[str] = None,
+    source: Optional[str] = None,
+    exclude_attempted: bool = Query(True, description="Skip questions already attempted"),
+    current_user: dict = Depends(get_current_user),
+    supabase: AsyncClient = Depends(get_supabase)
+):
+    """Generate a random practice set matching the filters.
+
+    Sampling happens in Postgres (practice_set RPC, ORDER BY random()
+    LIMIT n), so the response carries exactly the requested questions.
+    """
+    try:
+        result = await supabase.rpc(
+            "practice_set",
+            {
+                "uid": str(current_user.id),
+                "p_count": count,
+                "p_difficulty": difficulty,
+                "p_topic": topic,
+                "p_source": source,
+                "exclude_attempted": exclude_attempted,
+            },
+        ).execute()
+
+        return {"count": len(result.data), "questions": result.data}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -185,18 +252,25 @@ async def get_filters(
 async def get_question(
     ques_number: int,
     current_user: dict = Depends(get_current_user),
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     """Get specific question with solution"""
     try:
-        response = supabase.table("TMUA")\
-            .select("*")\
-            .eq("ques_number", ques_number)\
+        # maybe_single() asks PostgREST for a bare object (None when the
+        # row is missing) instead of a one-element array to unwrap
+        response = await (
+            supabase.table("TMUA")
+            .select("*")
+            .eq("ques_number", ques_number)
+            .maybe_single()
             .execute()
+        )
 
-        if not response.data:
+        if response is None:
             raise HTTPException(status_code=404, detail="Question not found")
 
-        return response.data[0]
+        return response.data
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,12 @@
+-- Weekly activity rollup for the admin dashboard. Computes both counters
+-- in one indexed pass server-side instead of shipping every attempt row
+-- of the last 7 days to the API.
+create or replace function weekly_stats()
+returns table (weekly_attempts bigint, weekly_active_users bigint)
+language sql
+stable
+as $$
+    select count(*), count(distinct user_id)
+    from user_progress
+    where attempted_at >= now() - interval '7 days';
+$$;
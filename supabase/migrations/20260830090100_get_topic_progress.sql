@@ -0,0 +1,23 @@
+-- Per-topic progress for one user, aggregated in the database so only
+-- one row per topic crosses the wire. The join runs ques_number (the
+-- TMUA primary key) against question_id as an index nested loop.
+create or replace function get_topic_progress(uid uuid)
+returns table (
+    topic text,
+    total_attempts bigint,
+    correct_attempts bigint,
+    average_time numeric
+)
+language sql
+stable
+as $$
+    select q.topic,
+           count(*),
+           count(*) filter (where p.is_correct),
+           avg(p.time_taken)
+    from user_progress p
+    join "TMUA" q on p.question_id = q.ques_number
+    where p.user_id = uid
+    group by q.topic
+    order by q.topic;
+$$;
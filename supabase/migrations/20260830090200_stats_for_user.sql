@@ -0,0 +1,13 @@
+-- Total and correct attempt counts for one user in a single round trip.
+-- COUNT(*) FILTER avoids issuing two separate queries for the pair.
+create or replace function stats_for_user(uid uuid, since timestamptz default null)
+returns table (total bigint, correct bigint)
+language sql
+stable
+as $$
+    select count(*),
+           count(*) filter (where is_correct)
+    from user_progress
+    where user_id = uid
+      and (since is null or attempted_at >= since);
+$$;
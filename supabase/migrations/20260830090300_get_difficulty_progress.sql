@@ -0,0 +1,21 @@
+-- Per-difficulty progress for one user, same shape as get_topic_progress.
+create or replace function get_difficulty_progress(uid uuid)
+returns table (
+    difficulty text,
+    total_attempts bigint,
+    correct_attempts bigint,
+    average_time numeric
+)
+language sql
+stable
+as $$
+    select q.difficulty,
+           count(*),
+           count(*) filter (where p.is_correct),
+           avg(p.time_taken)
+    from user_progress p
+    join "TMUA" q on p.question_id = q.ques_number
+    where p.user_id = uid
+    group by q.difficulty
+    order by q.difficulty;
+$$;
@@ -0,0 +1,30 @@
+-- Current and longest daily practice streaks via gap-and-islands:
+-- consecutive days share (day - row_number) and collapse into one run.
+-- Only two integers are returned regardless of attempt history size.
+create or replace function get_streaks(uid uuid)
+returns table (current_streak bigint, longest_streak bigint)
+language sql
+stable
+as $$
+    with d as (
+        select distinct attempted_at::date as day
+        from user_progress
+        where user_id = uid
+    ),
+    g as (
+        select day,
+               day - (row_number() over (order by day))::int as grp
+        from d
+    ),
+    runs as (
+        select min(day) as lo, max(day) as hi, count(*) as len
+        from g
+        group by grp
+    )
+    select coalesce(
+               max(len) filter (where hi >= current_date - 1),
+               0
+           ) as current_streak,
+           coalesce(max(len), 0) as longest_streak
+    from runs;
+$$;
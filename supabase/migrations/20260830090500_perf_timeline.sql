@@ -0,0 +1,16 @@
+-- Daily attempt/correct buckets for the performance timeline. One row
+-- per active day instead of one row per attempt.
+create or replace function perf_timeline(uid uuid, since date)
+returns table (day date, attempts bigint, correct bigint)
+language sql
+stable
+as $$
+    select attempted_at::date as day,
+           count(*),
+           count(*) filter (where is_correct)
+    from user_progress
+    where user_id = uid
+      and attempted_at >= since
+    group by 1
+    order by 1;
+$$;
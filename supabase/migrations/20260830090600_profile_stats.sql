@@ -0,0 +1,15 @@
+-- Per-difficulty totals for the profile screen. Difficulty is lowered
+-- here so the API maps rows straight into its easy/medium/hard buckets.
+create or replace function profile_stats(uid uuid)
+returns table (difficulty text, total bigint, correct bigint)
+language sql
+stable
+as $$
+    select lower(q.difficulty),
+           count(*),
+           count(*) filter (where p.is_correct)
+    from user_progress p
+    join "TMUA" q on p.question_id = q.ques_number
+    where p.user_id = uid
+    group by 1;
+$$;
@@ -0,0 +1,5 @@
+-- A user has at most one recorded attempt per question; make that a
+-- real constraint so /attempt writes can be single upserts (and batched
+-- upserts) instead of select-then-insert/update pairs.
+create unique index if not exists user_progress_user_question_key
+    on user_progress (user_id, question_id);
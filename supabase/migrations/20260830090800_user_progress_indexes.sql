@@ -0,0 +1,11 @@
+-- Covering indexes for the hot user_progress predicates. Every stats
+-- RPC filters by user_id (often with an attempted_at range) and joins
+-- question_id to TMUA.ques_number; INCLUDE makes these index-only
+-- scans so no heap lookups are needed per row.
+create index if not exists user_progress_user_attempted_idx
+    on user_progress (user_id, attempted_at desc)
+    include (is_correct, time_taken, question_id);
+
+create index if not exists user_progress_user_qid_idx
+    on user_progress (user_id, question_id)
+    include (is_correct, time_taken);
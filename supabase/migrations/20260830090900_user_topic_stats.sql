@@ -0,0 +1,78 @@
+-- Rollup of per-user/per-topic attempt stats, maintained transactionally
+-- on every write so /topic-progress reads O(#topics) rows with no
+-- aggregation, regardless of history size.
+create table if not exists user_topic_stats (
+    user_id uuid not null,
+    topic text not null,
+    total int not null default 0,
+    correct int not null default 0,
+    total_time bigint not null default 0,
+    primary key (user_id, topic)
+);
+
+create or replace function bump_user_topic_stats()
+returns trigger
+language plpgsql
+as $$
+declare
+    t text;
+begin
+    select topic into t from "TMUA" where ques_number = new.question_id;
+    if t is null then
+        return new;
+    end if;
+    if tg_op = 'INSERT' then
+        insert into user_topic_stats (user_id, topic, total, correct, total_time)
+        values (new.user_id, t, 1, new.is_correct::int, new.time_taken)
+        on conflict (user_id, topic) do update
+            set total = user_topic_stats.total + 1,
+                correct = user_topic_stats.correct + excluded.correct,
+                total_time = user_topic_stats.total_time + excluded.total_time;
+    else
+        -- An upserted retry replaces the old attempt: swap its contribution
+        update user_topic_stats
+        set correct = correct + new.is_correct::int - old.is_correct::int,
+            total_time = total_time + new.time_taken - old.time_taken
+        where user_id = new.user_id and topic = t;
+    end if;
+    return new;
+end;
+$$;
+
+drop trigger if exists user_progress_topic_stats on user_progress;
+create trigger user_progress_topic_stats
+    after insert or update on user_progress
+    for each row execute function bump_user_topic_stats();
+
+-- Backfill from existing history
+insert into user_topic_stats (user_id, topic, total, correct, total_time)
+select p.user_id,
+       q.topic,
+       count(*),
+       count(*) filter (where p.is_correct),
+       coalesce(sum(p.time_taken), 0)
+from user_progress p
+join "TMUA" q on p.question_id = q.ques_number
+group by p.user_id, q.topic
+on conflict (user_id, topic) do nothing;
+
+-- Serve reads from the rollup; same signature as before so the API
+-- handler doesn't change.
+create or replace function get_topic_progress(uid uuid)
+returns table (
+    topic text,
+    total_attempts bigint,
+    correct_attempts bigint,
+    average_time numeric
+)
+language sql
+stable
+as $$
+    select topic,
+           total::bigint,
+           correct::bigint,
+           case when total > 0 then total_time::numeric / total end
+    from user_topic_stats
+    where user_id = uid
+    order by topic;
+$$;
@@ -0,0 +1,35 @@
+-- Make streaks timezone-correct: "a day" is the user's local day, not
+-- the server's. attempted_at is stored in UTC; shifting it into the
+-- caller's zone before truncating keeps late-evening practice on the
+-- right side of midnight.
+drop function if exists get_streaks(uuid);
+
+create or replace function get_streaks(uid uuid, tz text default 'UTC')
+returns table (current_streak bigint, longest_streak bigint)
+language sql
+stable
+as $$
+    with d as (
+        select distinct (attempted_at at time zone tz)::date as day
+        from user_progress
+        where user_id = uid
+    ),
+    g as (
+        select day,
+               day - (row_number() over (order by day))::int as grp
+        from d
+    ),
+    runs as (
+        select min(day) as lo, max(day) as hi, count(*) as len
+        from g
+        group by grp
+    )
+    select coalesce(
+               max(len) filter (
+                   where hi >= (now() at time zone tz)::date - 1
+               ),
+               0
+           ) as current_streak,
+           coalesce(max(len), 0) as longest_streak
+    from runs;
+$$;
@@ -0,0 +1,19 @@
+-- Per-user attempt rollup for the admin user list: one grouped query
+-- instead of shipping every attempt row to the API.
+create or replace function user_progress_summary()
+returns table (
+    user_id uuid,
+    total_attempts bigint,
+    correct_attempts bigint,
+    last_active timestamptz
+)
+language sql
+stable
+as $$
+    select user_id,
+           count(*),
+           count(*) filter (where is_correct),
+           max(attempted_at)
+    from user_progress
+    group by user_id;
+$$;
@@ -0,0 +1,13 @@
+-- Distinct filter values for the question catalog in one row: the API
+-- previously shipped a catalog column per question and deduped in
+-- Python; DISTINCT aggregation in Postgres moves O(topics + sources)
+-- bytes instead of O(questions).
+create or replace function tmua_filters()
+returns table (topics text[], sources text[])
+language sql
+stable
+as $$
+    select array_agg(distinct topic order by topic),
+           array_agg(distinct source order by source)
+    from "TMUA";
+$$;
@@ -0,0 +1,7 @@
+-- Btree indexes for the /questions catalog filters. ques_number is
+-- already the primary key; topic, source and difficulty are the other
+-- equality filters the paginated listing applies. Low cardinality, but
+-- they let the planner skip full scans once the catalog grows.
+create index if not exists tmua_topic_idx on "TMUA" (topic);
+create index if not exists tmua_source_idx on "TMUA" (source);
+create index if not exists tmua_difficulty_idx on "TMUA" (difficulty);
@@ -0,0 +1,56 @@
+-- One query for the paginated question listing: annotate each TMUA row
+-- with the caller's attempt status via a LEFT JOIN (1:1 thanks to the
+-- user_progress (user_id, question_id) unique key), filter and page in
+-- SQL, and return the filtered total as a window count alongside the
+-- page. Replaces the old flow that shipped every attempt id to the API
+-- and fed thousands of ids back through an in.(...) URL filter.
+create or replace function questions_with_status(
+    uid uuid,
+    p_difficulty text default null,
+    p_topic text default null,
+    p_source text default null,
+    statuses text[] default null,
+    page_limit int default 10,
+    page_offset int default 0
+)
+returns table (
+    ques_number bigint,
+    question text,
+    options text,
+    topic text,
+    difficulty text,
+    source text,
+    image text,
+    status text,
+    total bigint
+)
+language sql
+stable
+as $$
+    with annotated as (
+        select t.ques_number,
+               t.question,
+               t.options,
+               t.topic,
+               t.difficulty,
+               t.source,
+               t.image,
+               case
+                   when up.question_id is null then 'unattempted'
+                   when up.is_correct then 'correct'
+                   else 'incorrect'
+               end as status
+        from "TMUA" t
+        left join user_progress up
+            on up.user_id = uid
+           and up.question_id = t.ques_number
+        where (p_difficulty is null or t.difficulty = p_difficulty)
+          and (p_topic is null or t.topic = p_topic)
+          and (p_source is null or t.source = p_source)
+    )
+    select annotated.*, count(*) over () as total
+    from annotated
+    where statuses is null or status = any(statuses)
+    order by ques_number
+    limit page_limit offset page_offset;
+$$;
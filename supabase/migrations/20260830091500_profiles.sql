@@ -0,0 +1,51 @@
+-- Shadow table for auth.users so the API can query user listings and
+-- counts with ordinary indexed selects instead of paging the whole
+-- GoTrue admin API on every dashboard load.
+create table if not exists profiles (
+    user_id uuid primary key references auth.users (id) on delete cascade,
+    email text,
+    name text,
+    role text not null default 'student'
+);
+
+create index if not exists profiles_role_idx on profiles (role);
+
+-- Keep profiles in lockstep with auth.users; role/name live in the
+-- user_metadata blob GoTrue maintains.
+create or replace function sync_profile()
+returns trigger
+language plpgsql
+security definer
+as $$
+begin
+    insert into profiles (user_id, email, name, role)
+    values (
+        new.id,
+        new.email,
+        new.raw_user_meta_data ->> 'name',
+        coalesce(new.raw_user_meta_data ->> 'role', 'student')
+    )
+    on conflict (user_id) do update
+        set email = excluded.email,
+            name = excluded.name,
+            role = excluded.role;
+    return new;
+end;
+$$;
+
+drop trigger if exists sync_profile_trg on auth.users;
+create trigger sync_profile_trg
+after insert or update on auth.users
+for each row execute function sync_profile();
+
+-- Backfill existing users
+insert into profiles (user_id, email, name, role)
+select id,
+       email,
+       raw_user_meta_data ->> 'name',
+       coalesce(raw_user_meta_data ->> 'role', 'student')
+from auth.users
+on conflict (user_id) do update
+    set email = excluded.email,
+        name = excluded.name,
+        role = excluded.role;
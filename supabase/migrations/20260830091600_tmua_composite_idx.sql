@@ -0,0 +1,11 @@
+-- Composite index for the filtered, ordered page walk inside
+-- questions_with_status: filter columns first, ques_number last so the
+-- planner can satisfy both the predicates and the ORDER BY from one
+-- ordered index scan (no sort node). The single-column indexes stay for
+-- queries that filter on source or difficulty alone.
+create index if not exists tmua_filter_order_idx
+    on "TMUA" (topic, source, difficulty, ques_number);
+
+-- user_progress (user_id, question_id) INCLUDE (is_correct, time_taken)
+-- already exists from the earlier covering-index migration, making the
+-- join side of the page query index-only.
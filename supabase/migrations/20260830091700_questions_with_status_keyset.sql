@@ -0,0 +1,61 @@
+-- Keyset ("seek") pagination for the question listing: a p_after cursor
+-- lets clients continue from the last ques_number they saw, which the
+-- planner serves as an index range scan regardless of depth — OFFSET
+-- still scans and discards offset rows. The signature changes, so the
+-- old function is dropped rather than overloaded.
+drop function if exists questions_with_status(
+    uuid, text, text, text, text[], int, int
+);
+
+create or replace function questions_with_status(
+    uid uuid,
+    p_difficulty text default null,
+    p_topic text default null,
+    p_source text default null,
+    statuses text[] default null,
+    page_limit int default 10,
+    page_offset int default 0,
+    p_after bigint default null
+)
+returns table (
+    ques_number bigint,
+    question text,
+    options text,
+    topic text,
+    difficulty text,
+    source text,
+    image text,
+    status text,
+    total bigint
+)
+language sql
+stable
+as $$
+    with annotated as (
+        select t.ques_number,
+               t.question,
+               t.options,
+               t.topic,
+               t.difficulty,
+               t.source,
+               t.image,
+               case
+                   when up.question_id is null then 'unattempted'
+                   when up.is_correct then 'correct'
+                   else 'incorrect'
+               end as status
+        from "TMUA" t
+        left join user_progress up
+            on up.user_id = uid
+           and up.question_id = t.ques_number
+        where (p_difficulty is null or t.difficulty = p_difficulty)
+          and (p_topic is null or t.topic = p_topic)
+          and (p_source is null or t.source = p_source)
+    )
+    select annotated.*, count(*) over () as total
+    from annotated
+    where (statuses is null or status = any(statuses))
+      and (p_after is null or annotated.ques_number > p_after)
+    order by ques_number
+    limit page_limit offset page_offset;
+$$;
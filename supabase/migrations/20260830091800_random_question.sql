@@ -0,0 +1,31 @@
+-- Random question pick, fully server-side: filters and the
+-- exclude-attempted anti-join run in Postgres, so the API never ships
+-- attempt id lists and receives exactly one row.
+create or replace function random_question(
+    uid uuid,
+    p_difficulty text default null,
+    p_topic text default null,
+    p_source text default null,
+    exclude_attempted boolean default true
+)
+returns setof "TMUA"
+language sql
+stable
+as $$
+    select t.*
+    from "TMUA" t
+    where (p_difficulty is null or t.difficulty = p_difficulty)
+      and (p_topic is null or t.topic = p_topic)
+      and (p_source is null or t.source = p_source)
+      and (
+          not exclude_attempted
+          or not exists (
+              select 1
+              from user_progress up
+              where up.user_id = uid
+                and up.question_id = t.ques_number
+          )
+      )
+    order by random()
+    limit 1;
+$$;
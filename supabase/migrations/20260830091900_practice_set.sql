@@ -0,0 +1,33 @@
+-- Random practice set, sampled in Postgres: ORDER BY random() LIMIT n
+-- under the same filters and anti-join as random_question, so the API
+-- receives exactly the requested rows instead of shuffling a candidate
+-- list in Python.
+create or replace function practice_set(
+    uid uuid,
+    p_count int default 10,
+    p_difficulty text default null,
+    p_topic text default null,
+    p_source text default null,
+    exclude_attempted boolean default true
+)
+returns setof "TMUA"
+language sql
+stable
+as $$
+    select t.*
+    from "TMUA" t
+    where (p_difficulty is null or t.difficulty = p_difficulty)
+      and (p_topic is null or t.topic = p_topic)
+      and (p_source is null or t.source = p_source)
+      and (
+          not exclude_attempted
+          or not exists (
+              select 1
+              from user_progress up
+              where up.user_id = uid
+                and up.question_id = t.ques_number
+          )
+      )
+    order by random()
+    limit p_count;
+$$;
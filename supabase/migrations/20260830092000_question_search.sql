@@ -0,0 +1,10 @@
+-- Full-text search over question bodies. The stored generated column
+-- keeps the tsvector up to date on writes, and the GIN index turns a
+-- search from a per-row to_tsvector re-parse into an index probe over
+-- matching rows.
+alter table "TMUA"
+    add column if not exists question_tsv tsvector
+    generated always as (to_tsvector('english', question)) stored;
+
+create index if not exists tmua_question_tsv_idx
+    on "TMUA" using gin (question_tsv);
@@ -0,0 +1,57 @@
+-- ORDER BY random() reads every row matching the filter on each call.
+-- Try a ~1% page sample first — O(pages sampled) on the common lightly
+-- filtered case — and fall back to the full random order only when the
+-- sample holds no matching row (heavy filters, tiny tables).
+create or replace function random_question(
+    uid uuid,
+    p_difficulty text default null,
+    p_topic text default null,
+    p_source text default null,
+    exclude_attempted boolean default true
+)
+returns setof "TMUA"
+language plpgsql
+volatile
+as $$
+begin
+    return query
+    select t.*
+    from "TMUA" t tablesample system (1)
+    where (p_difficulty is null or t.difficulty = p_difficulty)
+      and (p_topic is null or t.topic = p_topic)
+      and (p_source is null or t.source = p_source)
+      and (
+          not exclude_attempted
+          or not exists (
+              select 1
+              from user_progress up
+              where up.user_id = uid
+                and up.question_id = t.ques_number
+          )
+      )
+    order by random()
+    limit 1;
+
+    if found then
+        return;
+    end if;
+
+    return query
+    select t.*
+    from "TMUA" t
+    where (p_difficulty is null or t.difficulty = p_difficulty)
+      and (p_topic is null or t.topic = p_topic)
+      and (p_source is null or t.source = p_source)
+      and (
+          not exclude_attempted
+          or not exists (
+              select 1
+              from user_progress up
+              where up.user_id = uid
+                and up.question_id = t.ques_number
+          )
+      )
+    order by random()
+    limit 1;
+end;
+$$;